@@ -1,10 +1,19 @@
 import os
+import pickle
+import queue
+import shutil
 import threading
 import time
 import configparser
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from yt_dlp import YoutubeDL
+from yt_dlp.postprocessor import FFmpegExtractAudioPP
+from urllib.parse import urlsplit
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import vlc
@@ -12,9 +21,25 @@ import vlc
 # --- Config ---
 CONFIG_DIR = r"C:\tools\config"
 CONFIG_FILE = os.path.join(CONFIG_DIR, "pods.ini")
+CONFIG_CACHE = CONFIG_FILE + ".cache"
 os.makedirs(CONFIG_DIR, exist_ok=True)
 
+# --- Network ---
+FEED_WORKERS = 4
+PROCESS_PARSE_MIN = 8  # above this many feeds, parse in a process pool
+MAX_ENTRIES_PER_FEED = 20
+DOWNLOAD_WORKERS = 16  # total in flight, matches the adapter's pool_maxsize
+MAX_PER_HOST = 4
+CHUNK_SIZE = 1024*1024
+YT_FRAGMENT_WORKERS = 8
+YT_HTTP_CHUNK = 10*1024*1024
+
+# --- UI ---
+LOG_MAX_LINES = 1000
+
 # --- Helper functions ---
+_UNITS = [(1, "B"), (1<<10, "KB"), (1<<20, "MB"), (1<<30, "GB")]
+
 def format_bytes(n):
     """
     Convert a numeric value in bytes to a human-readable string representation
@@ -27,10 +52,28 @@ def format_bytes(n):
         (e.g., B, KB, MB, GB), formatted with two decimals.
     :rtype: str
     """
-    if n >= 1024**3: return f"{n/1024**3:.2f} GB"
-    if n >= 1024**2: return f"{n/1024**2:.2f} MB"
-    if n >= 1024:   return f"{n/1024:.2f} KB"
-    return f"{n} B"
+    idx = min(3, (int(n).bit_length()-1)//10) if n >= 1024 else 0
+    if idx == 0: return f"{n} B"
+    div, unit = _UNITS[idx]
+    return f"{n/div:.2f} {unit}"
+
+def _slim_parse(content, headers):
+    """
+    Parse a feed body and keep only what the update loop needs, as plain
+    (picklable) dicts so the result can come back from a worker process.
+
+    :param content: The raw feed body.
+    :type content: bytes
+    :param headers: The HTTP response headers, used for charset detection.
+    :type headers: dict
+    :return: One dict per entry with ``published_parsed`` and ``enclosures``.
+    :rtype: list
+    """
+    feed = feedparser.parse(content, response_headers=headers)
+    return [{"published_parsed": tuple(e.published_parsed) if e.get("published_parsed") else None,
+             "enclosures": [{"href": enc.href, "length": enc.get("length")}
+                            for enc in e.get("enclosures", []) if "href" in enc]}
+            for e in feed.entries]
 
 # --- Main App ---
 class AllInOneDownloader(tk.Tk):
@@ -47,9 +90,6 @@ class AllInOneDownloader(tk.Tk):
     :ivar config: Stores the configuration data for podcasts, including URLs and
         output paths.
     :type config: ConfigParser
-    :ivar podcasts: A dictionary containing podcast data loaded from the configuration
-        file. Each entry includes podcast URLs and output directories.
-    :type podcasts: dict
     :ivar vlc_inst: An instance of the VLC player.
     :type vlc_inst: vlc.Instance
     :ivar player: A VLC media player utilized for playing audio or video using the
@@ -62,6 +102,8 @@ class AllInOneDownloader(tk.Tk):
     :type pod_tree: ttk.Treeview
     :ivar tol_var: Controls the podcast update tolerance in MB for new content downloads.
     :type tol_var: tk.IntVar
+    :ivar max_var: The number of newest entries examined per feed on update.
+    :type max_var: tk.IntVar
     :ivar yt_url: A variable that holds the YouTube URL entered by the user.
     :type yt_url: tk.StringVar
     :ivar yt_type: A radio button variable used to indicate whether the YouTube download
@@ -83,20 +125,40 @@ class AllInOneDownloader(tk.Tk):
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # load podcasts config
-        self.config = configparser.ConfigParser()
-        self.config.read(CONFIG_FILE)
-        self.podcasts = {s: dict(self.config[s]) for s in self.config.sections()}
+        self.config = self._read_config()
+        self._config_lock = threading.Lock()
+        self._config_dirty = False
+
+        # shared HTTP session (keep-alive across download threads)
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                              max_retries=Retry(total=3, backoff_factor=0.5,
+                                                status_forcelist=[500,502,503,504]))
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        self._host_slots = {}  # netloc -> BoundedSemaphore(MAX_PER_HOST)
 
         # VLC player
         self.vlc_inst = vlc.Instance()
         self.player = self.vlc_inst.media_player_new()
         self.playlist = []  # list of (title, path)
+        self._pod_rows = {}  # name -> (url, output) as shown in pod_tree
 
         # build UI
         self._build_download_section()
         self._build_player_section()
         self._build_log_section()
 
+        # worker threads log through a queue drained on the Tk loop
+        self._log_q = queue.Queue()
+        self.after(100, self._pump_log)
+
+        # YouTube pipeline: one thread downloads, one converts to mp3
+        self._yt_queue = queue.Queue()
+        self._pp_queue = queue.Queue()
+        threading.Thread(target=self._yt_download_worker, daemon=True).start()
+        threading.Thread(target=self._yt_postprocess_worker, daemon=True).start()
+
     def _build_download_section(self):
         frame = ttk.LabelFrame(self, text="Downloads")
         frame.pack(fill="both", expand=False, padx=5, pady=5)
@@ -121,6 +183,9 @@ class AllInOneDownloader(tk.Tk):
         ttk.Label(btns, text="Tolerance (MB):").pack(side="left", padx=(10,2))
         self.tol_var = tk.IntVar(value=15)
         ttk.Entry(btns, textvariable=self.tol_var, width=4).pack(side="left")
+        ttk.Label(btns, text="Max eps:").pack(side="left", padx=(10,2))
+        self.max_var = tk.IntVar(value=MAX_ENTRIES_PER_FEED)
+        ttk.Entry(btns, textvariable=self.max_var, width=4).pack(side="left")
 
         self._refresh_pod_tree()
 
@@ -167,10 +232,20 @@ class AllInOneDownloader(tk.Tk):
         self.log_txt.pack(fill="both", expand=True)
 
     # --- Podcast callbacks ---
+    def _pod(self, nm):
+        return self.config[nm]
+
     def _refresh_pod_tree(self):
-        for i in self.pod_tree.get_children(): self.pod_tree.delete(i)
-        for name, d in self.podcasts.items():
-            self.pod_tree.insert("", "end", iid=name, values=(d["url"], d["output"]))
+        # only touch rows whose (url, output) changed since the last refresh
+        rows={name:(self._pod(name)["url"],self._pod(name)["output"]) for name in self.config.sections()}
+        gone=[name for name in self._pod_rows if name not in rows]
+        if gone: self.pod_tree.delete(*gone)
+        for name, vals in rows.items():
+            if name not in self._pod_rows:
+                self.pod_tree.insert("", "end", iid=name, values=vals)
+            elif self._pod_rows[name]!=vals:
+                self.pod_tree.item(name, values=vals)
+        self._pod_rows=rows
 
     def _pod_add(self):
         self._pod_dialog("Add Podcast")
@@ -184,7 +259,6 @@ class AllInOneDownloader(tk.Tk):
     def _pod_remove(self):
         for name in self.pod_tree.selection():
             self.config.remove_section(name)
-            self.podcasts.pop(name,None)
         self._save_config(); self._refresh_pod_tree()
 
     def _pod_dialog(self, title, name=None):
@@ -193,10 +267,10 @@ class AllInOneDownloader(tk.Tk):
         nvar=tk.StringVar(value=name or "")
         ttk.Entry(dlg,textvariable=nvar).grid(row=0,column=1,sticky="we")
         ttk.Label(dlg,text="URL:").grid(row=1,column=0,sticky="w")
-        uvar=tk.StringVar(value=(self.podcasts[name]["url"] if name else ""))
+        uvar=tk.StringVar(value=(self._pod(name)["url"] if name else ""))
         ttk.Entry(dlg,textvariable=uvar).grid(row=1,column=1,sticky="we")
         ttk.Label(dlg,text="Output:").grid(row=2,column=0,sticky="w")
-        ovar=tk.StringVar(value=(self.podcasts[name]["output"] if name else os.getcwd()))
+        ovar=tk.StringVar(value=(self._pod(name)["output"] if name else os.getcwd()))
         ttk.Entry(dlg,textvariable=ovar).grid(row=2,column=1,sticky="we")
         ttk.Button(dlg, text="Browse", command=lambda:self._choose_dir(ovar)).grid(row=2,column=2)
         def on_ok():
@@ -204,78 +278,257 @@ class AllInOneDownloader(tk.Tk):
             if not (nm and url and out): return
             if name and name!=nm:
                 self.config.remove_section(name)
-                self.podcasts.pop(name)
             if not self.config.has_section(nm):
                 self.config[nm]={}
+            if self.config[nm].get("url")!=url:
+                # cached validators belong to the old feed
+                self.config.remove_option(nm,"etag"); self.config.remove_option(nm,"modified")
             self.config[nm]["url"]=url
             self.config[nm]["output"]=out
-            self.podcasts[nm]={"url":url,"output":out}
             self._save_config(); self._refresh_pod_tree()
             dlg.destroy()
         ttk.Button(dlg,text="OK",command=on_ok).grid(row=3,column=1)
         dlg.columnconfigure(1, weight=1)
         dlg.grab_set(); dlg.wait_window()
 
+    def _read_config(self):
+        # reuse the last parse while pods.ini's mtime/size are unchanged
+        cfg = configparser.ConfigParser()
+        try:
+            st = os.stat(CONFIG_FILE)
+        except OSError:
+            return cfg
+        key = (st.st_mtime_ns, st.st_size)
+        try:
+            with open(CONFIG_CACHE,"rb") as f:
+                cached_key, raw = pickle.load(f)
+            if cached_key == key:
+                cfg.read_dict(raw)
+                return cfg
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            pass
+        cfg.read(CONFIG_FILE)
+        self._write_config_cache(cfg)
+        return cfg
+
+    def _write_config_cache(self, cfg):
+        try:
+            st = os.stat(CONFIG_FILE)
+            raw = {s: dict(cfg.items(s, raw=True)) for s in cfg.sections()}
+            with open(CONFIG_CACHE,"wb") as f:
+                pickle.dump(((st.st_mtime_ns, st.st_size), raw), f)
+        except OSError:
+            pass
+
     def _save_config(self):
-        with open(CONFIG_FILE,"w") as f:
-            self.config.write(f)
+        # Tk thread only: mark dirty and let one debounced write pick it up
+        with self._config_lock:
+            if self._config_dirty: return
+            self._config_dirty = True
+        self.after(500, self._flush_config_if_dirty)
+
+    def _mark_config_dirty(self):
+        # worker threads: no Tk calls here; _pump_log flushes it on the Tk loop
+        with self._config_lock:
+            self._config_dirty = True
+
+    def _flush_config_if_dirty(self):
+        with self._config_lock:
+            if not self._config_dirty: return
+            self._config_dirty = False
+            tmp = CONFIG_FILE+".tmp"
+            with open(tmp,"w") as f:
+                self.config.write(f)
+            os.replace(tmp, CONFIG_FILE)
+            self._write_config_cache(self.config)
 
     def _pod_update_selected(self):
         sel = self.pod_tree.selection()
         if not sel: return messagebox.showinfo("Info","Select >=1")
         tol = self.tol_var.get()*1024*1024
-        threading.Thread(target=self._do_podcast_update, args=(sel,tol), daemon=True).start()
+        limit = self.max_var.get()
+        threading.Thread(target=self._do_podcast_update, args=(sel,tol,limit), daemon=True).start()
 
-    def _do_podcast_update(self, names, tol):
+    def _do_podcast_update(self, names, tol, limit=MAX_ENTRIES_PER_FEED):
         tasks=[]
-        for nm in names:
-            url,out=self.podcasts[nm]["url"],self.podcasts[nm]["output"]
-            feed=feedparser.parse(url)
-            for e in feed.entries:
-                if "enclosures" not in e: continue
-                for enc in e.enclosures:
-                    fn=os.path.basename(enc.href.split("?")[0])
-                    path=os.path.join(out,fn)
-                    if os.path.exists(path) and abs(os.path.getsize(path)- (enc.length if "length" in enc else 0))<tol:
+        inline=len(names)<=PROCESS_PARSE_MIN
+        with ThreadPoolExecutor(max_workers=FEED_WORKERS) as ex:
+            futs={ex.submit(self._fetch_feed,nm,inline):nm for nm in names}
+            feeds=[(futs[f],f.result()) for f in as_completed(futs)]
+        if not inline:
+            # many feeds: parsing is CPU-bound, so spread it over cores
+            todo=[f for _,f in feeds if "content" in f]
+            with ProcessPoolExecutor() as ex:
+                parsed=ex.map(_slim_parse,[f.pop("content") for f in todo],[f.pop("headers") for f in todo])
+                for f,entries in zip(todo,parsed): f["entries"]=entries
+        # enclosure filtering stays on this thread, so `tasks` needs no lock
+        spans=[]  # (name, feed, start, end): which slice of tasks each feed added
+        sizes={}  # url -> remote size, probed at most once per run
+        for nm,feed in feeds:
+            if feed.get("status")==304:
+                self._log(f"{nm}: not modified")
+                continue
+            start=len(tasks)
+            tasks.extend(self._feed_tasks(feed, self._pod(nm)["output"], tol, limit, sizes))
+            spans.append((nm,feed,start,len(tasks)))
+        # enclosures landing on the same file would race on one .part; fetch each
+        # destination once and let every task that wanted it share the result
+        dests=[os.path.normcase(os.path.join(out,os.path.basename(url.split("?")[0]))) for url,out in tasks]
+        uniq={}
+        for d,t in zip(dests,tasks): uniq.setdefault(d,t)
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as ex:
+            done=dict(zip(uniq,ex.map(self._download_one, uniq.values())))
+        ok=[done[d] for d in dests]
+        # keep a feed's validators only once all its downloads made it; otherwise
+        # the next run would get a 304 and never retry the failed ones
+        changed=False
+        for nm,feed,start,end in spans:
+            if not all(ok[start:end]): continue
+            for key in ("etag","modified"):
+                if feed.get(key):
+                    with self._config_lock:
+                        # the podcast may have been removed while we downloaded
+                        if not self.config.has_section(nm): break
+                        # escape '%' so ConfigParser interpolation leaves it alone
+                        self.config[nm][key]=feed[key].replace("%","%%")
+                    changed=True
+        if changed:
+            self._mark_config_dirty()
+        self._log("Podcasts update done.")
+
+    def _feed_tasks(self, feed, out, tol, limit, sizes):
+        # newest first; everything past the first episode we already have is older
+        entries=sorted(feed["entries"], key=lambda e: e["published_parsed"] or (), reverse=True)
+        tasks=[]
+        # one directory read instead of exists()+getsize() per enclosure
+        existing={d.name: d.stat().st_size for d in os.scandir(out) if d.is_file()} if os.path.isdir(out) else {}
+        for e in entries[:limit]:
+            for enc in e["enclosures"]:
+                fn=os.path.basename(enc["href"].split("?")[0])
+                if fn in existing:
+                    try: size=int(enc.get("length") or 0)
+                    except ValueError: size=0  # e.g. length="unknown"
+                    size=size or self._remote_size(enc["href"],sizes)
+                    if size is None or abs(existing[fn]-size)<tol:
                         self._log(f"Skip {fn}")
-                        continue
-                    tasks.append((enc.href,out))
-        for url,out in tasks:
-            self._log(f"Downloading {url}…")
-            os.makedirs(out,exist_ok=True)
+                        return tasks
+                tasks.append((enc["href"],out))
+        return tasks
+
+    def _fetch_feed(self, nm, parse=True):
+        # fetch over the pooled session and give feedparser the bytes, so it
+        # never opens its own urllib connection; with parse=False the body is
+        # returned for the caller to parse elsewhere
+        pod=self._pod(nm)
+        hdrs={}
+        if pod.get("etag"): hdrs["If-None-Match"]=pod["etag"]
+        if pod.get("modified"): hdrs["If-Modified-Since"]=pod["modified"]
+        try:
+            r=self.http.get(pod["url"],headers=hdrs,timeout=15)
+            if r.status_code==304:
+                return {"status":304,"entries":[]}
+            r.raise_for_status()
+        except requests.RequestException as e:
+            self._log(f"{nm}: {e}")
+            return {"entries":[]}
+        feed={"status":r.status_code,"etag":r.headers.get("ETag"),"modified":r.headers.get("Last-Modified")}
+        if parse:
+            feed["entries"]=_slim_parse(r.content,dict(r.headers))
+        else:
+            feed["content"],feed["headers"]=r.content,dict(r.headers)
+        return feed
+
+    def _remote_size(self, url, cache):
+        if url not in cache:
             try:
-                r=requests.get(url,stream=True,timeout=15); r.raise_for_status()
-                fn=os.path.basename(url.split("?")[0])
-                with open(os.path.join(out,fn),"wb") as f:
-                    for chunk in r.iter_content(8192):
-                        f.write(chunk)
-                self._log(f"Saved {fn}")
-            except Exception as e:
-                self._log(f"Error: {e}")
-        self._log("Podcasts update done.")
+                r=self.http.head(url,allow_redirects=True,timeout=10)
+                n=r.headers.get("Content-Length")
+                cache[url]=int(n) if r.ok and n else None
+            except (requests.RequestException, ValueError):
+                cache[url]=None
+        return cache[url]
+
+    def _download_one(self, task):
+        # the pool is sized for many hosts; cap how hard we hit any single one
+        host=urlsplit(task[0]).netloc
+        with self._host_slots.setdefault(host, threading.BoundedSemaphore(MAX_PER_HOST)):
+            return self._fetch_enclosure(*task)
+
+    def _fetch_enclosure(self, url, out):
+        self._log(f"Downloading {url}…")
+        os.makedirs(out,exist_ok=True)
+        fn=os.path.basename(url.split("?")[0])
+        path=os.path.join(out,fn)
+        tmp=path+".part"
+        try:
+            # a leftover .part is an interrupted download; ask for the rest
+            have=os.path.getsize(tmp) if os.path.exists(tmp) else 0
+            # identity: Range offsets count encoded bytes, but we write decoded ones
+            hdrs={"Accept-Encoding":"identity"}
+            if have: hdrs["Range"]=f"bytes={have}-"
+            r=self.http.get(url,stream=True,timeout=15,headers=hdrs)
+            if r.status_code==416:
+                r.close(); os.unlink(tmp)
+                hdrs.pop("Range",None)
+                r=self.http.get(url,stream=True,timeout=15,headers=hdrs)
+            r.raise_for_status()
+            r.raw.decode_content=True
+            mode="ab" if r.status_code==206 else "wb"
+            if have: self._log(f"Resuming {fn} at {format_bytes(have)}" if mode=="ab" else f"Restarting {fn}")
+            with open(tmp,mode,buffering=CHUNK_SIZE) as f:
+                shutil.copyfileobj(r.raw,f,length=CHUNK_SIZE)
+            # only a complete download ever lands at the final path
+            os.replace(tmp,path)
+            self._log(f"Saved {fn}")
+            return True
+        except Exception as e:
+            self._log(f"Error: {e}")
+            return False
 
     # --- YouTube ---
     def _download_youtube(self):
         url, out, typ = self.yt_url.get().strip(), self.yt_out.get(), self.yt_type.get()
         if not url: return
-        threading.Thread(target=self._do_yt, args=(url,out,typ), daemon=True).start()
+        self._yt_queue.put((url,out,typ))
+        if self._yt_queue.qsize()>1: self._log(f"Queued {url}")
+
+    def _yt_download_worker(self):
+        while True:
+            self._do_yt(*self._yt_queue.get())
 
     def _do_yt(self, url, out, typ):
-        opts={"outtmpl":os.path.join(out,"%(title)s.%(ext)s")}
+        opts={"outtmpl":os.path.join(out,"%(title)s.%(ext)s"),
+              "concurrent_fragment_downloads":YT_FRAGMENT_WORKERS,
+              "http_chunk_size":YT_HTTP_CHUNK}
         if typ=="audio":
-            opts.update({"format":"bestaudio","postprocessors":[{"key":"FFmpegExtractAudio","preferredcodec":"mp3"}]})
+            opts["format"]="bestaudio/best"
         with YoutubeDL(opts) as y:
             self._log(f"Starting yt-dlp for {url}")
             try:
                 info=y.extract_info(url, download=True)
                 fn=y.prepare_filename(info)
-                self._log(f"Done: {fn}")
-                # add to playlist
                 if typ=="audio":
-                    self._add_to_playlist(fn)
+                    # convert on the other thread so the next URL can start downloading
+                    info["filepath"]=fn
+                    self._pp_queue.put(info)
+                else:
+                    self._log(f"Done: {fn}")
             except Exception as e:
                 self._log(f"yt-dlp error: {e}")
 
+    def _yt_postprocess_worker(self):
+        pp=FFmpegExtractAudioPP(preferredcodec="mp3")
+        while True:
+            info=self._pp_queue.get()
+            try:
+                leftovers,info=pp.run(info)
+                for f in leftovers:
+                    if os.path.exists(f): os.remove(f)
+                self._log(f"Done: {info['filepath']}")
+                self.after(0, self._add_to_playlist, info["filepath"])
+            except Exception as e:
+                self._log(f"ffmpeg error: {e}")
+
     # --- Player & playlist ---
     def _add_to_playlist(self, path):
         title=os.path.splitext(os.path.basename(path))[0]
@@ -306,13 +559,30 @@ class AllInOneDownloader(tk.Tk):
         if d: var.set(d)
 
     def _log(self, msg):
+        # called from worker threads too; only _pump_log touches the widget
         ts=time.strftime("%H:%M:%S")
-        self.log_txt.insert("end", f"[{ts}] {msg}\n")
-        self.log_txt.see("end")
+        self._log_q.put(f"[{ts}] {msg}\n")
+
+    def _pump_log(self):
+        batch=[]
+        try:
+            while True: batch.append(self._log_q.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            self.log_txt.insert("end", "".join(batch))
+            if int(self.log_txt.index("end-1c").split(".")[0]) > LOG_MAX_LINES:
+                self.log_txt.delete("1.0", f"end-{LOG_MAX_LINES}l")
+            self.log_txt.see("end")
+        if self._config_dirty:  # set by an update worker
+            self._flush_config_if_dirty()
+        self.after(100, self._pump_log)
 
     def on_close(self):
+        self._flush_config_if_dirty()
         self.player.stop()
         self.destroy()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # parse workers in the PyInstaller build
     AllInOneDownloader().mainloop()
@@ -1,42 +1,388 @@
 import configparser
 import datetime
+import email.utils
+import hashlib
 import io
+import json
 import os
+import queue
+import re
 import shutil
+import tempfile
 import threading
 import time
 import tkinter as tk
+import xml.etree.ElementTree as ET
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tkinter import filedialog, messagebox, ttk
 from tkinter.scrolledtext import ScrolledText
+from urllib.parse import unquote, urlsplit
 
-import feedparser
-import matplotlib
 import requests
-import vlc  # requires python-vlc
-from mutagen.id3 import ID3
-from PIL import Image, ImageTk
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-matplotlib.use("TkAgg")
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+# feedparser, matplotlib, vlc, mutagen and PIL are imported where they are
+# used; they are slow to import and most sessions never touch some of them.
 
 GUI_THEME = "alt"
 # Constants for config file paths
 CONFIG_DIR = r"C:\tools\config"
 USERS_CONFIG_PATH = os.path.join(CONFIG_DIR, "users.ini")
 DEFAULT_TOLERANCE_MB = 15
+# Raw feed bodies plus their ETag/Last-Modified, keyed by sha1(url)
+FEED_CACHE_DIR = os.path.join(CONFIG_DIR, "feeds_cache")
+FEED_CACHE_TTL = 600  # seconds before a cached feed is revalidated
+# Worker counts for parallel feed fetching and episode downloads
+# Feeds are mostly on different hosts, so size this like the executor default
+FEED_WORKERS = min(32, (os.cpu_count() or 4) + 4)
+DOWNLOAD_WORKERS = 4
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Oldest activity-log lines are dropped beyond this many
+LOG_MAX_LINES = 5000
+# One-off episodes at least this big are fetched as parallel byte ranges
+RANGE_MIN_SIZE = 64 * 1024 * 1024
+RANGE_PARTS = 8
+
+# Shared session so downloads reuse keep-alive connections
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]
+    ),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+
+_UNITS = ("B", "KB", "MB", "GB")
 
 
 def format_bytes(num_bytes):
     """Return a human-friendly string for bytes (in GB, MB, KB, or B)."""
-    if num_bytes >= 1024**3:
-        return f"{num_bytes/1024**3:.2f} GB"
-    elif num_bytes >= 1024**2:
-        return f"{num_bytes/1024**2:.2f} MB"
-    elif num_bytes >= 1024:
-        return f"{num_bytes/1024:.2f} KB"
-    else:
+    # bit_length picks the unit: every 10 bits is one step of 1024
+    idx = min(max(0, (int(num_bytes).bit_length() - 1) // 10), len(_UNITS) - 1)
+    if idx == 0:
         return f"{num_bytes} B"
+    return f"{num_bytes / (1 << (10 * idx)):.2f} {_UNITS[idx]}"
+
+
+def _atomic_write(path, data):
+    """Write bytes to path via a temp file + os.replace."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _cached_fetch(url):
+    """Fetch a feed through the on-disk cache. Returns (content, changed).
+
+    Within FEED_CACHE_TTL of the last fetch the cached bytes are returned
+    without touching the network; after that a conditional GET revalidates
+    them and a 304 just bumps the cache file's mtime.
+    """
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    xml_path = os.path.join(FEED_CACHE_DIR, key + ".xml")
+    meta_path = os.path.join(FEED_CACHE_DIR, key + ".meta")
+    try:
+        age = time.time() - os.stat(xml_path).st_mtime
+        with open(xml_path, "rb") as f:
+            cached = f.read()
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        cached, meta, age = None, {}, None
+
+    if cached is not None and age < FEED_CACHE_TTL:
+        return cached, False
+
+    headers = {}
+    if cached is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("modified"):
+            headers["If-Modified-Since"] = meta["modified"]
+    r = SESSION.get(url, headers=headers, timeout=(5, 30))
+    if r.status_code == 304 and cached is not None:
+        os.utime(xml_path)
+        return cached, False
+    r.raise_for_status()
+
+    os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+    _atomic_write(xml_path, r.content)
+    meta = {
+        "etag": r.headers.get("ETag"),
+        "modified": r.headers.get("Last-Modified"),
+    }
+    _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+    return r.content, True
+
+
+def _dir_sizes(path):
+    """Map file name -> size for one directory, from a single scandir."""
+    try:
+        with os.scandir(path) as it:
+            return {e.name: e.stat().st_size for e in it if e.is_file()}
+    except OSError:
+        return {}
+
+
+def _open_unbuffered(path):
+    """Open path for binary writing with no Python-side buffer."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    return os.fdopen(os.open(path, flags, 0o644), "wb", buffering=0)
+
+
+def _decoded_length(r):
+    """Bytes the response will write to disk, or 0 if it isn't known."""
+    # Content-Length counts the encoded body, so it only helps unencoded ones
+    if r.headers.get("Content-Encoding"):
+        return 0
+    try:
+        return int(r.headers.get("Content-Length") or 0)
+    except ValueError:
+        return 0
+
+
+def _preallocate(f, size):
+    """Reserve size bytes for f up front so the file is laid out in one go.
+
+    Callers truncate at the final position afterwards in case less arrives.
+    """
+    if size <= 0:
+        return
+    if hasattr(os, "posix_fallocate"):
+        os.posix_fallocate(f.fileno(), 0, size)
+    else:
+        f.truncate(size)
+
+
+def _fetch_range(url, filepath, start, end):
+    """Download bytes start..end (inclusive) of url into place in filepath."""
+    headers = {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+    with SESSION.get(url, headers=headers, stream=True, timeout=(5, 30)) as r:
+        r.raise_for_status()
+        if r.status_code != 206:
+            raise requests.HTTPError("Server ignored the Range header", response=r)
+        with open(filepath, "r+b") as f:
+            f.seek(start)
+            shutil.copyfileobj(r.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+            if f.tell() != end + 1:
+                raise OSError(f"Short read for bytes {start}-{end}")
+
+
+def _file_size(path):
+    """Size of path in bytes, or -1 if it doesn't exist."""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return -1
+
+
+def _head(url):
+    """HEAD url for its unencoded size and range support."""
+    return SESSION.head(
+        url,
+        allow_redirects=True,
+        headers={"Accept-Encoding": "identity"},
+        timeout=(5, 30),
+    )
+
+
+def _ranged_download(head, filepath):
+    """Download head.url as RANGE_PARTS concurrent byte ranges.
+
+    head is the _head() response for the URL. Returns False without touching
+    filepath if the server doesn't advertise byte ranges, the file is under
+    RANGE_MIN_SIZE or any range fails; the caller then falls back to a plain
+    GET.
+    """
+    if not head.ok or head.headers.get("Accept-Ranges", "").lower() != "bytes":
+        return False
+    size = _decoded_length(head)
+    if size < RANGE_MIN_SIZE:
+        return False
+
+    # Preallocated, so its size says nothing about progress; kept apart from
+    # the resumable .part file _plain_download uses
+    tmp = filepath + ".ranges"
+    part = -(-size // RANGE_PARTS)
+    try:
+        with _open_unbuffered(tmp) as f:
+            _preallocate(f, size)
+            f.truncate(size)  # posix_fallocate leaves size alone if bigger
+        with ThreadPoolExecutor(max_workers=RANGE_PARTS) as pool:
+            futures = [
+                pool.submit(_fetch_range, head.url, tmp, a, min(a + part, size) - 1)
+                for a in range(0, size, part)
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                for pending in futures:
+                    pending.cancel()
+                raise
+    except (requests.RequestException, urllib3.exceptions.HTTPError, OSError):
+        # Mid-body failures surface from r.raw as bare urllib3 errors.
+        # Don't leave a full-size preallocated file behind in the output folder
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return False
+    with open(tmp, "rb") as f:
+        _release_page_cache(f)
+    os.replace(tmp, filepath)
+    return True
+
+
+def _plain_download(url, filepath, watch=None):
+    """Download url into filepath over a single connection.
+
+    Data goes to filepath + ".part" first; if that is left over from an
+    interrupted attempt, the download resumes where it stopped. watch, if
+    given, is called with the open file and returns an Event that is set
+    once the copy ends.
+    """
+    part = filepath + ".part"
+    have = max(_file_size(part), 0)
+    headers = {"Range": f"bytes={have}-", "Accept-Encoding": "identity"}
+    with SESSION.get(
+        url, headers=headers if have else None, stream=True, timeout=(5, 30)
+    ) as r:
+        if r.status_code == 416:
+            # .part is no prefix of the current episode; start over
+            os.remove(part)
+            return _plain_download(url, filepath, watch)
+        r.raise_for_status()
+        r.raw.decode_content = True
+        # No preallocation here: .part's size is the resume offset
+        if r.status_code == 206:
+            f = open(part, "ab", buffering=0)
+        else:
+            f = _open_unbuffered(part)
+        with f:
+            done = watch(f) if watch else None
+            try:
+                shutil.copyfileobj(r.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+            finally:
+                if done:
+                    done.set()
+            _release_page_cache(f)
+    os.replace(part, filepath)
+
+
+def _release_page_cache(f):
+    """Flush a finished file and drop it from the page cache where supported.
+
+    Episodes are usually listened to once, so there is no point keeping
+    them cached at the expense of everything else.
+    """
+    if hasattr(os, "posix_fadvise"):
+        os.fsync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+# Just the parts of an RSS <item> the downloader needs
+Enclosure = namedtuple("Enclosure", "href published")
+
+
+def _first_enclosure(xml_bytes):
+    """Return the newest episode's enclosure URL.
+
+    Gives "" if that episode has no enclosure and None if the feed has no
+    episodes. Plain RSS stops parsing at the first <item>; anything else
+    (Atom, broken markup...) goes through feedparser.
+    """
+    try:
+        for _, elem in ET.iterparse(io.BytesIO(xml_bytes), events=("end",)):
+            if elem.tag == "item":
+                enc = elem.find("enclosure")
+                return enc.get("url", "") if enc is not None else ""
+    except ET.ParseError:
+        pass
+    import feedparser
+
+    feed = feedparser.parse(xml_bytes)
+    if not feed.entries:
+        return None
+    enclosures = feed.entries[0].get("enclosures")
+    return enclosures[0].get("href", "") if enclosures else ""
+
+
+# Characters Windows won't take in a file name; ':' would even open an NTFS
+# alternate data stream, and '/' or '\' would escape the output folder
+_UNSAFE_NAME_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+def _url_filename(url):
+    """Local file name for a download: the last URL path segment, unquoted."""
+    name = unquote(urlsplit(url).path.rsplit("/", 1)[-1])
+    # Windows also drops trailing dots and spaces, so don't rely on them
+    name = _UNSAFE_NAME_CHARS.sub("_", name).rstrip(". ")
+    return name or "download.bin"
+
+
+def _existing_file(sizes, url):
+    """Return (file name, size or -1) for url among a folder's _dir_sizes.
+
+    Files saved before names were unquoted kept the raw URL basename; reuse
+    such a file rather than fetching the episode again under a second name.
+    """
+    name = _url_filename(url)
+    if name not in sizes:
+        legacy = os.path.basename(url.split("?")[0])
+        if legacy in sizes:
+            return legacy, sizes[legacy]
+    return name, sizes.get(name, -1)
+
+
+def _parse_pubdate(text):
+    """Parse an RFC 822 pubDate into a naive UTC datetime (or None)."""
+    if not text:
+        return None
+    try:
+        dt = email.utils.parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _fast_enclosures(xml_bytes, max_episodes=None, filter_date=None):
+    """Yield Enclosures from an RSS feed without building the full document.
+
+    Items are streamed with iterparse and cleared as soon as they are read,
+    and parsing stops after max_episodes items. pubDate is only parsed when
+    filter_date is given; otherwise Enclosure.published is None.
+    """
+    count, published = 0, None
+    for _, elem in ET.iterparse(io.BytesIO(xml_bytes), events=("end",)):
+        if elem.tag != "item":
+            continue
+        if filter_date:
+            published = _parse_pubdate(elem.findtext("pubDate"))
+            if published and published < filter_date:
+                elem.clear()
+                continue
+        for enc in elem.findall("enclosure"):
+            if enc.get("url"):
+                yield Enclosure(enc.get("url"), published)
+        elem.clear()
+        count += 1
+        if max_episodes is not None and count >= max_episodes:
+            return
 
 
 class PodcastManagerApp:
@@ -47,7 +393,9 @@ class PodcastManagerApp:
         self.root.geometry("840x550")
 
         self.stop_flag = False
-        self.switch_user_requested = False
+        # Messages from log() on any thread; only _flush_log, polling on the
+        # Tk thread, writes them to the widgets
+        self._log_queue = deque(maxlen=10_000)
 
 
         style = ttk.Style(self.root)
@@ -57,7 +405,9 @@ class PodcastManagerApp:
             pass
 
         # Set user-specific podcasts config path
-        self.CONFIG_PATH = os.path.join(CONFIG_DIR, f"pods_admin.ini")
+        self.CONFIG_PATH = os.path.join(CONFIG_DIR, "pods_admin.json")
+        # Pre-JSON config, migrated once by ensure_config
+        self.LEGACY_CONFIG_PATH = os.path.join(CONFIG_DIR, "pods_admin.ini")
         self.podcasts = {}
         self.check_vars = {}
 
@@ -66,18 +416,38 @@ class PodcastManagerApp:
 
         # Playlist: list of tuples (title, filepath)
         self.playlist = []
+        # casefolded titles, kept parallel to self.playlist for searching
+        self._playlist_folded = []
+        # playlist index shown on each listbox row; rows differ while filtered
+        self._playlist_rows = []
+        # Parsed ID3 tags keyed by (path, mtime), newest last; see _tags
+        self._id3_cache = {}
+        # Album art PhotoImages keyed by a hash of the APIC bytes, newest last
+        self._art_cache = {}
+        self._art_shown = None
 
         # Interval for checking drive connectivity (milliseconds)
         self.drive_check_interval = 30000  # 30 seconds
         # Dictionary for status labels (green/red) for each podcast
         self.drive_status_labels = {}
-
-        # Build the GUI
+        # drive -> (total, used, free, timestamp), or None if unreachable.
+        # Filled by _poll_drives so disk_usage never blocks the Tk thread.
+        self._drive_cache = {}
+        self._poll_now = threading.Event()
+
+        # Concurrent episode downloads, for both updates and one-offs
+        self.download_workers = DOWNLOAD_WORKERS
+        # One-off downloads are queued to a few long-lived workers rather
+        # than each getting a thread of its own
+        self._one_off_queue = queue.Queue()
+        for _ in range(self.download_workers):
+            threading.Thread(target=self._one_off_worker, daemon=True).start()
+
+        # Build the GUI (the VLC player is created with the Player tab)
         self.build_gui()
-
-        # Create VLC media player instance
-        self.vlc_instance = vlc.Instance()
-        self.media_player = self.vlc_instance.media_player_new()
+        self.root.after(100, self._flush_log)
+        # Started once the widgets it redraws exist
+        threading.Thread(target=self._poll_drives, daemon=True).start()
 
         # Current playing episode info
         self.current_episode = None
@@ -85,22 +455,37 @@ class PodcastManagerApp:
 
     def ensure_config(self):
         os.makedirs(CONFIG_DIR, exist_ok=True)
-        if not os.path.exists(self.CONFIG_PATH):
-            with open(self.CONFIG_PATH, "w") as f:
-                f.write("")
+        if os.path.exists(self.CONFIG_PATH):
+            return
+        podcasts = {}
+        if os.path.exists(self.LEGACY_CONFIG_PATH):
+            legacy = configparser.ConfigParser(interpolation=None)
+            legacy.read(self.LEGACY_CONFIG_PATH)
+            for section in legacy.sections():
+                podcasts[section] = {
+                    "url": legacy[section]["url"],
+                    "output": legacy[section]["output"],
+                }
+        _atomic_write(self.CONFIG_PATH, json.dumps(podcasts, indent=2).encode("utf-8"))
 
     def load_config(self):
-        self.config = configparser.ConfigParser()
-        self.config.read(self.CONFIG_PATH)
-        for section in self.config.sections():
-            self.podcasts[section] = {
-                "url": self.config[section]["url"],
-                "output": self.config[section]["output"],
-            }
+        with open(self.CONFIG_PATH, encoding="utf-8") as f:
+            self.podcasts = json.load(f)
+        self._index_drives()
+
+    def _index_drives(self):
+        """Group podcast names by the drive of their output folder."""
+        by_drive = {}
+        for name, data in self.podcasts.items():
+            drive = os.path.splitdrive(data["output"])[0]  # e.g., 'D:', 'C:'
+            by_drive.setdefault(drive, []).append(name)
+        # Swapped in whole; _poll_drives reads it from its own thread
+        self._drive_to_podcasts = by_drive
 
     def save_config(self):
-        with open(self.CONFIG_PATH, "w") as configfile:
-            self.config.write(configfile)
+        """Write the podcast list atomically so a crash can't truncate it."""
+        data = json.dumps(self.podcasts, indent=2).encode("utf-8")
+        _atomic_write(self.CONFIG_PATH, data)
 
     def build_gui(self):
         # STATUS BAR AT THE TOP:
@@ -143,27 +528,44 @@ class PodcastManagerApp:
         self.notebook.add(self.tab_podcasts, text="Podcasts")
         self.build_podcast_tab(self.tab_podcasts)
 
-        # Storage Tab
+        # Storage Tab (built on first visit, the matplotlib chart is costly)
         self.tab_storage = ttk.Frame(self.notebook)
         self.notebook.add(self.tab_storage, text="Storage")
-        self.build_storage_tab(self.tab_storage)
 
-        # Activity Tab
+        # Activity Tab (built now so no log lines are missed)
         self.tab_activity = ttk.Frame(self.notebook)
         self.notebook.add(self.tab_activity, text="Activity")
         self.build_activity_tab(self.tab_activity)
 
-        # Player Tab
+        # Player Tab (built on first visit)
         self.tab_player = ttk.Frame(self.notebook)
         self.notebook.add(self.tab_player, text="Player")
-        self.build_player_tab(self.tab_player)
+
+        self._lazy_tabs = {
+            str(self.tab_storage): (self.build_storage_tab, self.tab_storage),
+            str(self.tab_player): (self.build_player_tab, self.tab_player),
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+    def _on_tab_changed(self, event):
+        """Build a lazy tab the first time it is selected."""
+        builder = self._lazy_tabs.pop(self.notebook.select(), None)
+        if builder:
+            build, parent = builder
+            build(parent)
 
     def build_activity_tab(self, parent):
-        self.log_text = ScrolledText(parent, height=20, wrap="word")
+        self.log_text = ScrolledText(parent, height=20, wrap="word", state="disabled")
         self.log_text.pack(fill="both", expand=True, padx=5, pady=5)
 
     # ------------------ Player Tab ------------------
     def build_player_tab(self, parent):
+        import vlc  # requires python-vlc
+
+        # Create VLC media player instance
+        self.vlc_instance = vlc.Instance()
+        self.media_player = self.vlc_instance.media_player_new()
+
         frame = ttk.Frame(parent)
         frame.pack(fill="both", expand=True, padx=5, pady=5)
 
@@ -207,6 +609,9 @@ class PodcastManagerApp:
         ttk.Label(search_frame, text="Search Title:").grid(row=0, column=0, padx=5)
 
         self.search_var = tk.StringVar()
+        # Filter as the user types, at most once per 150 ms pause
+        self._search_after_id = None
+        self.search_var.trace_add("write", self._on_search_changed)
         ttk.Entry(search_frame, textvariable=self.search_var, width=30).grid(
             row=0, column=1, padx=5
         )
@@ -256,55 +661,73 @@ class PodcastManagerApp:
             title = os.path.splitext(os.path.basename(filepath))[0]
             if filepath.lower().endswith(".mp3"):
                 try:
-                    tags = ID3(filepath)
-                    if "TIT2" in tags:
-                        title = tags["TIT2"].text[0]
+                    tags = self._tags(filepath)
+                    tit2 = tags.get("TIT2")
+                    if tit2 is not None:
+                        title = tit2.text[0]
                 except Exception as e:
                     self.log(f"Error reading MP3 title: {e}")
             self.playlist.append((title, filepath))
-            self.playlist_listbox.insert(tk.END, title)
+            self._playlist_folded.append(title.casefold())
+            # Only show it if it passes the current search filter
+            if self.search_var.get().strip().casefold() in title.casefold():
+                self._playlist_rows.append(len(self.playlist) - 1)
+                self.playlist_listbox.insert(tk.END, title)
+
+    def _tags(self, path):
+        """Return path's ID3 tags, parsing the file only if it has changed."""
+        from mutagen.id3 import ID3
+
+        key = (path, os.path.getmtime(path))
+        tags = self._id3_cache.pop(key, None)
+        if tags is None:
+            tags = ID3(path, translate=False)
+        self._id3_cache[key] = tags  # re-inserted, so it counts as newest
+        if len(self._id3_cache) > 128:
+            del self._id3_cache[next(iter(self._id3_cache))]
+        return tags
 
     def remove_selected_playlist_item(self):
         selection = self.playlist_listbox.curselection()
         if selection:
-            idx = selection[0]
-            self.playlist_listbox.delete(idx)
+            row = selection[0]
+            idx = self._playlist_rows.pop(row)
+            self.playlist_listbox.delete(row)
             del self.playlist[idx]
+            del self._playlist_folded[idx]
+            self._playlist_rows = [i - (i > idx) for i in self._playlist_rows]
 
     def load_selected_playlist_item(self):
         selection = self.playlist_listbox.curselection()
         if selection:
-            idx = selection[0]
+            idx = self._playlist_rows[selection[0]]
             title, filepath = self.playlist[idx]
             self.load_audio_file(filepath)
 
     # ------------------ Storage Tab ------------------
     def build_storage_tab(self, parent):
-        ttk.Button(parent, text="Refresh Storage Info", command=self.show_storage).pack(
-            pady=5
-        )
+        # Re-polls disk usage; _drives_polled redraws once it is in
+        ttk.Button(
+            parent, text="Refresh Storage Info", command=self._poll_now.set
+        ).pack(pady=5)
         self.storage_chart_frame = ttk.Frame(parent)
         self.storage_chart_frame.pack(fill="both", expand=True)
         self.show_storage()
 
     def show_storage(self):
-        for widget in self.storage_chart_frame.winfo_children():
-            widget.destroy()
+        if not hasattr(self, "storage_chart_frame"):
+            return  # Storage tab not opened yet
+        import matplotlib
 
-        drives = {}
-        for data in self.podcasts.values():
-            drive = os.path.splitdrive(data["output"])[0]
-            if drive not in drives:
-                try:
-                    total, used, free = shutil.disk_usage(drive + os.sep)
-                    drives[drive] = (total, used, free)
-                except Exception:
-                    # Could not access drive
-                    drives[drive] = (0, 0, 0)
+        matplotlib.use("TkAgg")
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
 
-        # Adjust figure size based on number of drives
-        fig = Figure(figsize=(8, max(1.5 * len(drives), 2)), dpi=100)
-        ax = fig.add_subplot(111)
+        drives = {}
+        for drive in self._drive_to_podcasts:
+            usage = self._drive_cache.get(drive)
+            # Not polled yet, or could not access drive
+            drives[drive] = usage[:3] if usage else (0, 0, 0)
 
         drive_labels = []
         used_space = []
@@ -315,11 +738,39 @@ class PodcastManagerApp:
             used_space.append(used / (1024**3))  # GB
             free_space.append(free / (1024**3))  # GB
 
-        ax.barh(drive_labels, used_space, label="Used Space (GB)")
-        ax.barh(drive_labels, free_space, left=used_space, label="Free Space (GB)")
+        # Same drives as last time: move the existing bars and labels rather
+        # than building a new figure
+        chart = getattr(self, "_storage_chart", None)
+        if chart is not None and chart["labels"] == drive_labels:
+            for i, (u, f) in enumerate(zip(used_space, free_space)):
+                chart["used"][i].set_width(u)
+                chart["free"][i].set_x(u)
+                chart["free"][i].set_width(f)
+                used_text, free_text = chart["texts"][i]
+                used_text.set_position((u / 2, i))
+                used_text.set_text(f"{u:.1f} GB Used")
+                free_text.set_position((u + f / 2, i))
+                free_text.set_text(f"{f:.1f} GB Free")
+            chart["ax"].relim()
+            chart["ax"].autoscale_view()
+            chart["canvas"].draw_idle()
+            return
 
+        for widget in self.storage_chart_frame.winfo_children():
+            widget.destroy()
+
+        # Adjust figure size based on number of drives
+        fig = Figure(figsize=(8, max(1.5 * len(drives), 2)), dpi=100)
+        ax = fig.add_subplot(111)
+
+        used_bars = ax.barh(drive_labels, used_space, label="Used Space (GB)")
+        free_bars = ax.barh(
+            drive_labels, free_space, left=used_space, label="Free Space (GB)"
+        )
+
+        texts = []
         for i, (u, f) in enumerate(zip(used_space, free_space)):
-            ax.text(
+            used_text = ax.text(
                 u / 2,
                 i,
                 f"{u:.1f} GB Used",
@@ -329,7 +780,7 @@ class PodcastManagerApp:
                 fontsize=8,
                 fontweight="bold",
             )
-            ax.text(
+            free_text = ax.text(
                 u + f / 2,
                 i,
                 f"{f:.1f} GB Free",
@@ -339,6 +790,7 @@ class PodcastManagerApp:
                 fontsize=8,
                 fontweight="bold",
             )
+            texts.append((used_text, free_text))
 
         ax.set_xlabel("Storage (GB)")
         ax.set_title("Drive Storage Usage")
@@ -349,13 +801,31 @@ class PodcastManagerApp:
         canvas = FigureCanvasTkAgg(fig, master=self.storage_chart_frame)
         canvas.draw()
         canvas.get_tk_widget().pack(fill="both", expand=True)
+        self._storage_chart = {
+            "labels": drive_labels,
+            "ax": ax,
+            "canvas": canvas,
+            "used": used_bars,
+            "free": free_bars,
+            "texts": texts,
+        }
+
+    def _on_search_changed(self, *_):
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(150, self.search_playlist)
 
     def search_playlist(self):
-        query = self.search_var.get().strip().lower()
+        self._search_after_id = None
+        query = self.search_var.get().strip().casefold()
+        self._playlist_rows = [
+            i for i, folded in enumerate(self._playlist_folded) if query in folded
+        ]
         self.playlist_listbox.delete(0, tk.END)
-        for title, path in self.playlist:
-            if query in title.lower():
-                self.playlist_listbox.insert(tk.END, title)
+        if self._playlist_rows:
+            self.playlist_listbox.insert(
+                tk.END, *(self.playlist[i][0] for i in self._playlist_rows)
+            )
 
     def load_audio_file(self, filepath=None):
         if not filepath:
@@ -371,21 +841,30 @@ class PodcastManagerApp:
             self.log(f"Loaded file: {os.path.basename(filepath)}")
             if filepath.lower().endswith(".mp3"):
                 try:
-                    tags = ID3(filepath)
-                    apic = None
-                    for key in tags.keys():
-                        if key.startswith("APIC"):
-                            apic = tags.get(key)
-                            break
+                    from PIL import Image, ImageTk
+
+                    tags = self._tags(filepath)
+                    apic = next(
+                        (v for k, v in tags.items() if k.startswith("APIC")), None
+                    )
+                    key = None
                     if apic is not None:
-                        art_data = apic.data
-                        image = Image.open(io.BytesIO(art_data))
-                        image = image.resize((100, 100))
-                        photo = ImageTk.PhotoImage(image)
+                        key = hashlib.blake2b(apic.data, digest_size=8).digest()
+                        photo = self._art_cache.pop(key, None)
+                        if photo is None:
+                            image = Image.open(io.BytesIO(apic.data))
+                            image = image.resize((100, 100), Image.BILINEAR)
+                            photo = ImageTk.PhotoImage(image)
+                        self._art_cache[key] = photo  # newest last
+                        if len(self._art_cache) > 32:
+                            del self._art_cache[next(iter(self._art_cache))]
+                    # Episodes of one podcast usually share a cover; only
+                    # touch the label when the artwork actually changes
+                    if key != self._art_shown:
+                        photo = self._art_cache.get(key, "")
                         self.album_art_label.config(image=photo)
                         self.album_art_label.image = photo
-                    else:
-                        self.album_art_label.config(image="")
+                        self._art_shown = key
                 except Exception as e:
                     self.log(f"Could not load album art: {e}")
 
@@ -406,9 +885,10 @@ class PodcastManagerApp:
                 title = os.path.splitext(os.path.basename(self.current_episode))[0]
                 if self.current_episode.lower().endswith(".mp3"):
                     try:
-                        tags = ID3(self.current_episode)
-                        if "TIT2" in tags:
-                            title = tags["TIT2"].text[0]
+                        tags = self._tags(self.current_episode)
+                        tit2 = tags.get("TIT2")
+                        if tit2 is not None:
+                            title = tit2.text[0]
                     except Exception:
                         pass
             self.current_episode = None
@@ -489,6 +969,7 @@ class PodcastManagerApp:
         self.check_vars = {}
         # clear out any previous status labels
         self.drive_status_labels.clear()
+        self._index_drives()
 
         for idx, (name, data) in enumerate(self.podcasts.items()):
             var = tk.BooleanVar()
@@ -506,24 +987,50 @@ class PodcastManagerApp:
             status_lbl.grid(row=idx, column=1, sticky="w", padx=8)
             self.drive_status_labels[name] = status_lbl
 
-    def check_drives(self):
-        for name, data in self.podcasts.items():
-            drive = os.path.splitdrive(data["output"])[0]  # e.g., 'D:', 'C:'
-            # If the drive is connected, show green, else red
-            if self.is_drive_connected(drive):
-                self.drive_status_labels[name].config(text="🟢")
-            else:
-                self.drive_status_labels[name].config(text="🔴")
+    def _poll_drives(self):
+        """Refresh disk usage for each distinct output drive, off the Tk thread."""
+        redraw = True
+        while True:
+            # Redraw right away on startup or when asked to (refresh button,
+            # podcast added/edited, update finished); otherwise the 30 s
+            # check_drives timer picks the new values up. Cleared before
+            # polling so a request made meanwhile gets a fresh round.
+            redraw = redraw or self._poll_now.is_set()
+            self._poll_now.clear()
+            for drive in list(self._drive_to_podcasts):
+                try:
+                    usage = shutil.disk_usage(drive + os.sep)
+                    self._drive_cache[drive] = (*usage, time.time())
+                except Exception:
+                    self._drive_cache[drive] = None
+            if redraw:
+                try:
+                    self.root.after(0, self._drives_polled)
+                    redraw = False
+                except tk.TclError:
+                    return  # window is gone
+                except RuntimeError:
+                    pass  # mainloop not running yet; try again shortly
+            self._poll_now.wait(1 if redraw else self.drive_check_interval / 1000)
+
+    def _drives_polled(self):
+        self.update_drive_labels()
+        self.show_storage()
 
+    def check_drives(self):
+        self.update_drive_labels()
         # schedule next check
         self.root.after(self.drive_check_interval, self.check_drives)
 
+    def update_drive_labels(self):
+        for drive, names in self._drive_to_podcasts.items():
+            # If the drive is connected, show green, else red
+            text = "🟢" if self.is_drive_connected(drive) else "🔴"
+            for name in names:
+                self.drive_status_labels[name].config(text=text)
+
     def is_drive_connected(self, drive):
-        try:
-            shutil.disk_usage(drive + os.sep)
-            return True
-        except:
-            return False
+        return self._drive_cache.get(drive) is not None
 
     # ------------------ Podcasts Management Methods ------------------
     def open_add_podcast_dialog(self):
@@ -563,10 +1070,10 @@ class PodcastManagerApp:
             u = url_var.get().strip()
             o = output_var.get().strip()
             if n and u and o:
-                self.config[n] = {"url": u, "output": o}
                 self.podcasts[n] = {"url": u, "output": o}
                 self.save_config()
                 self.refresh_list()
+                self._poll_now.set()
             dialog.destroy()
 
         ttk.Button(btn_frame, text="OK", command=on_ok).pack(side="left", padx=5)
@@ -609,11 +1116,10 @@ class PodcastManagerApp:
             u = url_var.get().strip()
             o = output_var.get().strip()
             if u and o:
-                self.config[podcast_name]["url"] = u
-                self.config[podcast_name]["output"] = o
                 self.podcasts[podcast_name] = {"url": u, "output": o}
                 self.save_config()
                 self.refresh_list()
+                self._poll_now.set()
             dialog.destroy()
 
         ttk.Button(btn_frame, text="OK", command=on_ok).pack(side="left", padx=5)
@@ -640,7 +1146,6 @@ class PodcastManagerApp:
             )
             return
         for name in selected:
-            self.config.remove_section(name)
             del self.podcasts[name]
         self.save_config()
         self.refresh_list()
@@ -660,16 +1165,33 @@ class PodcastManagerApp:
     def update_podcasts(self, podcast_names):
 
         max_episodes, tasks = None, []
+        # Podcasts sharing a feed URL (e.g. mirrored outputs) parse it once
+        by_url = {}
         for name in podcast_names:
-            url = self.podcasts[name]["url"]
-            feed = feedparser.parse(url)
-            entries = self.filter_entries(feed.entries, max_episodes, filter_date=None)
-            for entry in entries:
-                if "enclosures" in entry:
-                    for enc in entry.enclosures:
-                        tasks.append((name, enc, self.podcasts[name]["output"]))
-
-        total_tasks = len(tasks)
+            by_url.setdefault(self.podcasts[name]["url"], []).append(name)
+        # Fetch and parse all feeds concurrently; tasks is only built here
+        with ThreadPoolExecutor(max_workers=FEED_WORKERS) as pool:
+            futures = {
+                pool.submit(self._parse_feed, names[0], max_episodes): names
+                for names in by_url.values()
+            }
+            for future in as_completed(futures):
+                enclosures = future.result()
+                for name in futures[future]:
+                    output = self.podcasts[name]["output"]
+                    tasks.extend((name, enc, output) for enc in enclosures)
+
+        # One directory listing per output folder instead of a stat per episode
+        existing = {output: _dir_sizes(output) for output in {t[2] for t in tasks}}
+        # Enclosures resolving to the same file (generic names, repeated items,
+        # podcasts sharing a folder) would race on one .part; keep the first
+        jobs = {}
+        for podcast_name, enc, output in tasks:
+            filename, size = _existing_file(existing[output], enc.href)
+            dest = os.path.normcase(os.path.abspath(os.path.join(output, filename)))
+            jobs.setdefault(dest, (podcast_name, enc, output, filename, size))
+
+        total_tasks = len(jobs)
         if total_tasks == 0:
             self.log("No new episodes to download.")
             return
@@ -678,56 +1200,127 @@ class PodcastManagerApp:
             0, lambda: self.progress_bar.config(maximum=total_tasks, value=0)
         )
 
-        for podcast_name, enc, output in tasks:
-            file_url = enc.href
-            filename = os.path.basename(file_url.split("?")[0])
-            filepath = os.path.join(output, filename)
-
-            if os.path.exists(filepath):
-                try:
-                    existing_size = os.path.getsize(filepath)
-                    if existing_size > 10 * 1024 * 1024:
-                        self.log(f"Skipping existing file over {DEFAULT_TOLERANCE_MB}MB: {filename}")
-                        self.root.after(0, lambda: self.progress_bar.step(1))
-                        if self.stop_flag:
-                            self.log("Stopping after current download.")
-                            break
-                        continue
-                except Exception as e:
-                    self.log(
-                        f"Error checking existing file: {filename}, proceeding to download. Error: {e}"
+        workers = min(self.download_workers, total_tasks)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._download_one, *job) for job in jobs.values()]
+            # Repaint the bar every ~1% or 200 ms rather than once per task
+            done, posted, last_post = 0, 0, time.monotonic()
+            step = max(1, total_tasks // 100)
+            for future in as_completed(futures):
+                done += 1
+                now = time.monotonic()
+                if done - posted >= step or now - last_post >= 0.2:
+                    self.root.after(
+                        0, lambda v=done: self.progress_bar.configure(value=v)
                     )
+                    posted, last_post = done, now
+                if self.stop_flag:
+                    self.log("Stopping after current downloads.")
+                    for pending in futures:
+                        pending.cancel()
+                    break
+            self.root.after(0, lambda v=done: self.progress_bar.configure(value=v))
 
-            self.log(f"Downloading file for '{podcast_name}'...")
-            try:
-                with requests.get(file_url, stream=True, timeout=10) as r:
-                    r.raise_for_status()
-                    os.makedirs(output, exist_ok=True)
-
-                    with open(filepath, "wb") as f:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                # Minimal text update
-                                progress_text = "Keeping it real."
-                                self.root.after(
-                                    0,
-                                    lambda text=progress_text: self.file_progress_label.config(
-                                        text=text
-                                    ),
-                                )
-                self.log(f"Downloaded: {filename}")
-            except Exception as e:
-                self.log(f"Error downloading {filename}: {e}")
+        self.log("Update completed.")
+        # Re-poll so the chart shows usage after the downloads
+        self._poll_now.set()
 
-            self.root.after(0, lambda: self.progress_bar.step(1))
+    def _parse_feed(self, name, max_episodes=None):
+        """Return a feed's enclosures."""
+        # An unchanged feed is still parsed: the cache only saves the network
+        # round trip, and the existing-file check decides what to download
+        try:
+            content, _ = _cached_fetch(self.podcasts[name]["url"])
+        except requests.RequestException as e:
+            self.log(f"Error fetching feed for '{name}': {e}")
+            return []
 
-            if self.stop_flag:
-                self.log("Stopping after current download.")
-                break
+        try:
+            enclosures = list(_fast_enclosures(content, max_episodes))
+        except ET.ParseError:
+            enclosures = []
+        if not enclosures:
+            # Not plain RSS (Atom, broken markup...); let feedparser cope
+            import feedparser
+
+            feed = feedparser.parse(content)
+            enclosures = [
+                Enclosure(enc.href, None)
+                for entry in self.filter_entries(feed.entries, max_episodes, None)
+                for enc in entry.get("enclosures", [])
+                if "href" in enc
+            ]
+        return enclosures
+
+    def _download_one(self, podcast_name, enc, output, filename, existing_size=-1):
+        """Download a single enclosure to output/filename unless already there.
+
+        existing_size is the size of the file already in output, or -1.
+        """
+        if self.stop_flag:
+            return  # queued before Stop but already picked up by a worker
+        file_url = enc.href
+        filepath = os.path.join(output, filename)
+
+        if existing_size > 10 * 1024 * 1024:
+            self.log(
+                f"Skipping existing file over {DEFAULT_TOLERANCE_MB}MB: {filename}"
+            )
+            return
+        if existing_size >= 0 and existing_size == self._remote_size(file_url):
+            self.log(f"Skipping existing file: {filename}")
+            return
 
-        self.log("Update completed.")
-        self.root.after(0, self.show_storage)
+        self.log(f"Downloading file for '{podcast_name}'...")
+        try:
+            os.makedirs(output, exist_ok=True)
+            # Minimal text update, then let a watcher thread sample the
+            # file position so the copy loop itself stays in C
+            self.root.after(
+                0, lambda: self.file_progress_label.config(text="Keeping it real.")
+            )
+            # Resumes from a .part left by an interrupted run
+            _plain_download(
+                file_url, filepath, lambda f: self._watch_progress(f, filename)
+            )
+            self.log(f"Downloaded: {filename}")
+        except Exception as e:
+            self.log(f"Error downloading {filename}: {e}")
+
+    def _remote_size(self, url):
+        """Unencoded Content-Length from a HEAD request, or -1 if unknown."""
+        try:
+            head = _head(url)
+        except requests.RequestException:
+            return -1
+        if not head.ok:
+            return -1
+        return _decoded_length(head) or -1
+
+    def _watch_progress(self, f, filename):
+        """Start posting how much of filename has been written, twice a second.
+
+        Returns the Event that stops it.
+        """
+        done = threading.Event()
+        threading.Thread(
+            target=self._post_progress, args=(f, filename, done), daemon=True
+        ).start()
+        return done
+
+    def _post_progress(self, f, filename, done):
+        while not done.wait(0.5):
+            # The wait can time out just as the download ends and closes f
+            try:
+                text = f"{filename}: {format_bytes(f.tell())}"
+            except ValueError:
+                return
+            try:
+                self.root.after(
+                    0, lambda text=text: self.file_progress_label.config(text=text)
+                )
+            except (RuntimeError, tk.TclError):
+                return  # window closed
 
     def download_one_off(self):
         dialog = tk.Toplevel(self.root)
@@ -758,9 +1351,7 @@ class PodcastManagerApp:
             u = url_var.get().strip()
             o = output_var.get().strip()
             if u and o:
-                threading.Thread(
-                    target=self._one_off_task, args=(u, o), daemon=True
-                ).start()
+                self._one_off_queue.put((u, o))
             dialog.destroy()
 
         btn_frame = ttk.Frame(dialog)
@@ -771,33 +1362,51 @@ class PodcastManagerApp:
         )
         dialog.wait_window(dialog)
 
+    def _one_off_worker(self):
+        while True:
+            url, output = self._one_off_queue.get()
+            try:
+                self._one_off_task(url, output)
+            except Exception as e:
+                self.log(f"One-off download failed for {url}: {e}")
+
     def _one_off_task(self, url, output):
-        feed = feedparser.parse(url)
-        if not feed.entries:
-            self.root.after(
-                0, lambda: messagebox.showinfo("Error", "No entries found.")
-            )
+        """Download the newest episode of url; results go to the log."""
+        # Same ETag/Last-Modified cache the podcast updates use, so re-running
+        # a one-off on an unchanged feed costs at most a 304
+        try:
+            content, _ = _cached_fetch(url)
+        except requests.RequestException as e:
+            self.log(f"Error fetching feed {url}: {e}")
+            return
+        file_url = _first_enclosure(content)
+        if file_url is None:
+            self.log(f"No entries found in {url}.")
             return
 
-        entry = feed.entries[0]
-        if "enclosures" in entry:
-            enc = entry.enclosures[0]
-            file_url = enc.href
-            filename = os.path.basename(file_url.split("?")[0])
+        if file_url:
+            filename = _url_filename(file_url)
             filepath = os.path.join(output, filename)
 
             try:
-                with requests.get(file_url, stream=True, timeout=10) as r:
-                    r.raise_for_status()
-                    with open(filepath, "wb") as f:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                self.root.after(
-                    0, lambda: messagebox.showinfo("Success", f"Downloaded: {filename}")
-                )
+                try:
+                    head = _head(file_url)
+                except requests.RequestException as e:
+                    # Timeouts or servers refusing HEAD: still try the GET
+                    self.log(f"HEAD failed for {filename} ({e}); downloading anyway")
+                    head = None
+                expected = _decoded_length(head) if head is not None and head.ok else 0
+                if expected and _file_size(filepath) == expected:
+                    self.log(f"Already have: {filename}")
+                    return
+                # A .part left by an interrupted plain download is resumed
+                # rather than thrown away by a fresh ranged one
+                resuming = _file_size(filepath + ".part") >= 0
+                if head is None or resuming or not _ranged_download(head, filepath):
+                    _plain_download(file_url, filepath)
+                self.log(f"Downloaded: {filename}")
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showinfo("Error", str(e)))
+                self.log(f"Error downloading {filename}: {e}")
 
     def set_stop_flag(self):
         self.stop_flag = True
@@ -805,33 +1414,56 @@ class PodcastManagerApp:
 
     def log(self, message):
         print(message)
+        self._log_queue.append(message)
 
-        def update_ui():
-            self.progress_label.config(text=message)
-            if hasattr(self, "log_text"):
-                self.log_text.insert("end", message + "\n")
-                self.log_text.see("end")
-
-        self.root.after(0, update_ui)
+    def _flush_log(self):
+        """Write everything logged in the last 100 ms with one insert."""
+        batch = []
+        while self._log_queue:
+            batch.append(self._log_queue.popleft())
+        try:
+            if batch:
+                self.progress_label.config(text=batch[-1])
+                if hasattr(self, "log_text"):
+                    # Read-only to the user; unlocked just for this write
+                    self.log_text.configure(state="normal")
+                    self.log_text.insert("end", "\n".join(batch) + "\n")
+                    lines = int(self.log_text.index("end-1c").split(".")[0])
+                    if lines > LOG_MAX_LINES:
+                        self.log_text.delete("1.0", f"{lines - LOG_MAX_LINES}.0")
+                    self.log_text.configure(state="disabled")
+                    self.log_text.see("end")
+            self.root.after(100, self._flush_log)
+        except tk.TclError:
+            pass  # widgets destroyed (window closed or user switched)
 
     def filter_entries(self, entries, max_episodes, filter_date):
         filtered = []
+        # Compare raw (Y, M, D, h, m, s) tuples rather than building datetimes
+        cutoff = filter_date.timetuple()[:6] if filter_date else None
+        # Feeds are normally newest-first; once the order has been seen to
+        # descend (and never ascend) the first stale entry ends the scan
+        descending, ascending, prev = False, False, None
         for entry in entries:
-            if filter_date:
-                if "published_parsed" in entry and entry.published_parsed:
-                    entry_date = datetime.datetime(*entry.published_parsed[:6])
-                    if entry_date < filter_date:
+            if cutoff:
+                published = entry.get("published_parsed")
+                if published:
+                    stamp = tuple(published[:6])
+                    if prev is not None:
+                        descending |= stamp < prev
+                        ascending |= stamp > prev
+                    prev = stamp
+                    if stamp < cutoff:
+                        if descending and not ascending:
+                            break
                         continue
             filtered.append(entry)
-        if max_episodes is not None:
-            filtered = filtered[:max_episodes]
+            if max_episodes is not None and len(filtered) >= max_episodes:
+                break
         return filtered
 
 
 if __name__ == "__main__":
-    while True:
-        root = tk.Tk()
-        app = PodcastManagerApp(root, "admin")
-        root.mainloop()
-        if not app.switch_user_requested:
-            break
+    root = tk.Tk()
+    app = PodcastManagerApp(root, "admin")
+    root.mainloop()
@@ -1,3 +1,4 @@
+import ctypes
 import json
 import logging
 import os
@@ -7,6 +8,7 @@ import shutil
 import sys
 import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox, ttk
 
 # Global counters for backup statistics
@@ -15,9 +17,18 @@ files_skipped = 0
 errors_count = 0
 files_processed = 0
 total_files = 0
+# backup_file runs on several threads at once; guards the counters above
+counters_lock = threading.Lock()
+
+# Number of files copied concurrently
+BACKUP_WORKERS = 8
+# Post a progress update once every this many files
+PROGRESS_EVERY = 64
 
 # Queue for inter-thread progress updates
 progress_queue = queue.Queue()
+# Window told about new progress_queue messages via <<Progress>>, if one is open
+progress_window = None
 
 # Configuration directory and file location
 CONFIG_DIR = r"C:/CopyDeckFiles"
@@ -92,6 +103,15 @@ def load_config():
             sys.exit(1)
 
 
+def save_config(config):
+    """Write the configuration back to CONFIG_FILE."""
+    try:
+        with open(CONFIG_FILE, "w") as f:
+            json.dump(config, f, indent=4)
+    except Exception as e:
+        logging.warning(f"Could not save config file: {e}")
+
+
 def validate_config(config):
     """
     Verify that each source folder exists and the backup destination is valid.
@@ -129,79 +149,165 @@ def validate_config(config):
         sys.exit(1)
 
 
-def count_files_in_folder(source_folder):
-    """Count total files in a folder recursively."""
-    count = 0
-    for _, _, files in os.walk(source_folder):
-        count += len(files)
-    return count
+def scan_files(source_folder):
+    """
+    Yield a DirEntry for every file under source_folder, like os.walk would find.
+    Unlike os.walk the entries are kept, so their stat() results are cached.
+    """
+    stack = [source_folder]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if not entry.is_dir():
+                        yield entry
+                    elif not entry.is_symlink():
+                        stack.append(entry.path)
+        except OSError:
+            continue  # unreadable directory; os.walk skips these too
 
 
-def backup_file(src_file, dest_file):
+def _fastcopy(src, dst):
     """
-    Copy a file if the source is newer.
-    Also update the console with the currently processing file using ANSI colors.
+    Copy file contents in the kernel (CopyFileExW on Windows, sendfile on Linux),
+    then the timestamps and permission bits like shutil.copy2.
     """
-    global files_copied, files_skipped, errors_count, files_processed
-    dest_dir = os.path.dirname(dest_file)
-    if not os.path.exists(dest_dir):
+    if platform.system() == "Windows":
+        from ctypes import wintypes
+
+        copy_file_ex = ctypes.windll.kernel32.CopyFileExW
+        copy_file_ex.argtypes = [
+            wintypes.LPCWSTR,
+            wintypes.LPCWSTR,
+            wintypes.LPVOID,
+            wintypes.LPVOID,
+            wintypes.LPBOOL,
+            wintypes.DWORD,
+        ]
+        copy_file_ex.restype = wintypes.BOOL
+        cancel = wintypes.BOOL(False)
+        if not copy_file_ex(src, dst, None, None, ctypes.byref(cancel), 0):
+            raise ctypes.WinError()
+    elif hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+    else:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
+def post_progress(msg):
+    """Queue a progress message and wake the progress window to drain it."""
+    progress_queue.put(msg)
+    win = progress_window
+    if win is not None:
         try:
-            os.makedirs(dest_dir)
-        except Exception as e:
-            logging.error(f"Error creating directory {dest_dir}: {e}")
-            errors_count += 1
-            return
+            win.event_generate("<<Progress>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            pass  # window already closed or mainloop gone
 
-    # Update the console with the file being processed
-    sys.stdout.write("\r\033[93mProcessing: " + src_file + "\033[0m" + " " * 20)
-    sys.stdout.flush()
 
+def progress_update(processed):
+    """Build the progress queue message for the given number of processed files."""
+    # total_files is last run's count, so only an estimate
+    if total_files > 0:
+        progress_percent = min(int((processed / total_files) * 100), 100)
+        text = f"Processed {processed} of ~{total_files} files."
+        return "update", progress_percent, text
+    return "update", None, f"Processed {processed} files."
+
+
+def backup_file(src_file, dest_file, src_stat=None):
+    """
+    Copy a file unless the destination has the same size and is not older.
+    src_stat may be passed in when the caller already has it from a scan.
+    Every PROGRESS_EVERY files, also show the current file on the console using ANSI colors.
+    """
+    global files_copied, files_skipped, errors_count, files_processed
     try:
-        if os.path.exists(dest_file):
-            src_mtime = os.path.getmtime(src_file)
-            dest_mtime = os.path.getmtime(dest_file)
+        try:
+            dest_stat = os.stat(dest_file)
+        except FileNotFoundError:
+            dest_stat = None
+        if dest_stat is not None:
+            if src_stat is None:
+                src_stat = os.stat(src_file)
             # If destination is up-to-date, skip copying
-            if src_mtime <= dest_mtime:
-                files_skipped += 1
+            if (
+                dest_stat.st_size == src_stat.st_size
+                and dest_stat.st_mtime >= src_stat.st_mtime
+            ):
+                with counters_lock:
+                    files_skipped += 1
                 return
-        shutil.copy2(src_file, dest_file)
-        files_copied += 1
+        _fastcopy(src_file, dest_file)
+        with counters_lock:
+            files_copied += 1
     except Exception as e:
         logging.error(f"Error copying {src_file} to {dest_file}: {e}")
-        errors_count += 1
+        with counters_lock:
+            errors_count += 1
     finally:
-        files_processed += 1
-        progress_percent = (
-            int((files_processed / total_files) * 100) if total_files > 0 else 100
-        )
-        progress_queue.put(
-            (
-                "update",
-                progress_percent,
-                f"Processed {files_processed} of {total_files} files.",
+        with counters_lock:
+            files_processed += 1
+            processed = files_processed
+        if processed % PROGRESS_EVERY == 0:
+            post_progress(progress_update(processed))
+            # Update the console with the file being processed
+            sys.stdout.write(
+                "\r\033[93mProcessing: " + src_file + "\033[0m" + " " * 20
             )
-        )
+            sys.stdout.flush()
+
+
+def backup_entry(entry, dest_file):
+    """Back up a DirEntry from scan_files, reusing its cached stat."""
+    try:
+        src_stat = entry.stat()
+    except OSError:
+        src_stat = None  # backup_file will hit and report the error itself
+    backup_file(entry.path, dest_file, src_stat)
 
 
 def backup_folder(source_folder, backup_destination):
     """
-    Recursively back up files from source_folder.
+    Yield (DirEntry, dest_file) for every file under source_folder.
     The destination will contain a subfolder named after the source folder's basename.
+    Destination directories are created here, once each, before their files are yielded.
     """
+    global errors_count
     base_folder_name = os.path.basename(os.path.normpath(source_folder))
-    for root, _, files in os.walk(source_folder):
-        for file in files:
-            src_file = os.path.join(root, file)
-            rel_path = os.path.relpath(src_file, source_folder)
-            dest_folder = os.path.join(backup_destination, base_folder_name)
-            dest_file = os.path.join(dest_folder, rel_path)
-            backup_file(src_file, dest_file)
+    dest_folder = os.path.join(backup_destination, base_folder_name)
+    seen_dirs = set()
+    failed_dirs = set()
+    for entry in scan_files(source_folder):
+        rel_path = os.path.relpath(entry.path, source_folder)
+        dest_file = os.path.join(dest_folder, rel_path)
+        dest_dir = os.path.dirname(dest_file)
+        if dest_dir not in seen_dirs:
+            seen_dirs.add(dest_dir)
+            try:
+                os.makedirs(dest_dir, exist_ok=True)
+            except Exception as e:
+                logging.error(f"Error creating directory {dest_dir}: {e}")
+                failed_dirs.add(dest_dir)
+        if dest_dir in failed_dirs:
+            with counters_lock:
+                errors_count += 1
+            continue
+        yield entry, dest_file
 
 
 def backup_worker():
     """
     Worker function to run the backup process in a separate thread.
-    Loads configuration, counts total files, processes backups, and sends a final summary.
+    Loads configuration, processes backups, and sends a final summary.
     """
     global total_files, files_copied, files_skipped, errors_count, files_processed
     files_copied = files_skipped = errors_count = files_processed = 0
@@ -210,24 +316,32 @@ def backup_worker():
     source_folders = config.get("source_folders", [])
     backup_destination = config.get("backup_destination", "")
 
-    total_files = 0
-    for folder in source_folders:
-        if os.path.exists(folder):
-            total_files += count_files_in_folder(folder)
-        else:
-            logging.warning(f"Source folder does not exist: {folder}")
-
-    if total_files == 0:
-        progress_queue.put(("done", 0, "No files to backup."))
+    # No separate counting walk: progress is measured against the number of
+    # files the previous run saw (0 on the first run, so no percentage)
+    total_files = config.get("last_file_count", 0)
+
+    # Copies overlap so one file's metadata stalls don't hold up the rest
+    with ThreadPoolExecutor(max_workers=BACKUP_WORKERS) as executor:
+        for folder in source_folders:
+            if os.path.exists(folder):
+                post_progress(("update", None, f"Backing up folder: {folder}"))
+                pairs = backup_folder(folder, backup_destination)
+                for _ in executor.map(lambda pair: backup_entry(*pair), pairs):
+                    pass
+            else:
+                logging.warning(f"Source folder does not exist: {folder}")
+                errors_count += 1
+
+    # backup_file only reports every PROGRESS_EVERY files; report the remainder
+    if files_processed % PROGRESS_EVERY:
+        post_progress(progress_update(files_processed))
+
+    if files_processed == 0:
+        post_progress(("done", 0, "No files to backup."))
         return
-
-    for folder in source_folders:
-        if os.path.exists(folder):
-            progress_queue.put(("update", None, f"Backing up folder: {folder}"))
-            backup_folder(folder, backup_destination)
-        else:
-            logging.warning(f"Source folder does not exist: {folder}")
-            errors_count += 1
+    if files_processed != total_files:
+        config["last_file_count"] = files_processed
+        save_config(config)
 
     summary = (
         f"Backup Completed:\n\n"
@@ -235,7 +349,7 @@ def backup_worker():
         f"Files Skipped: {files_skipped}\n"
         f"Errors: {errors_count}"
     )
-    progress_queue.put(("done", 100, summary))
+    post_progress(("done", 100, summary))
 
 
 def start_backup_thread():
@@ -257,6 +371,7 @@ def run_backup_process(root, main_menu):
     Hide the main menu frame, display the progress window,
     run the backup process, then return to the main menu.
     """
+    global progress_window
     # Hide main menu frame
     main_menu.pack_forget()
     progress_win = tk.Toplevel(root)
@@ -271,7 +386,8 @@ def run_backup_process(root, main_menu):
     status_label = tk.Label(progress_win, text="Starting backup...", padx=10)
     status_label.pack()
 
-    def update_progress():
+    def update_progress(event=None):
+        global progress_window
         try:
             while True:
                 msg = progress_queue.get_nowait()
@@ -286,6 +402,7 @@ def run_backup_process(root, main_menu):
                     summary = msg[2]
                     progress_bar["value"] = percent
                     status_label.config(text="Backup Completed")
+                    progress_window = None
                     show_summary_popup(progress_win, summary)
                     progress_win.destroy()
                     # Re-show main menu frame
@@ -293,8 +410,10 @@ def run_backup_process(root, main_menu):
                     return
         except queue.Empty:
             pass
-        progress_win.after(100, update_progress)
 
+    # The worker fires <<Progress>> after each message, so there is nothing to poll
+    progress_win.bind("<<Progress>>", update_progress)
+    progress_window = progress_win
     start_backup_thread()
     update_progress()
 